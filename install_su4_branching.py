@@ -7,6 +7,7 @@ Fixes: Generates correct __init__.py with NO broken imports
 Run: python install_su4_branching_corrected.py
 """
 
+import importlib.util
 import os
 import sys
 import subprocess
@@ -46,25 +47,22 @@ def check_python_version():
 
 
 def check_dependencies():
-    """Check if required packages are installed"""
+    """Check if required packages are installed and return the missing ones"""
     required = ['numpy', 'pandas', 'setuptools']
     missing = []
     
     print_info("Checking dependencies...")
     for package in required:
-        try:
-            __import__(package)
-            print_success(f"{package} installed")
-        except ImportError:
+        if importlib.util.find_spec(package) is None:
             missing.append(package)
             print_error(f"{package} NOT found")
+        else:
+            print_success(f"{package} installed")
     
     if missing:
-        print_info(f"\nInstalling missing packages: {', '.join(missing)}")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade"] + missing)
-        print_success("Dependencies installed")
+        print_info(f"\nMissing packages will be installed with the package: {', '.join(missing)}")
     
-    return True
+    return missing
 
 
 def create_correct_init(project_dir):
@@ -89,8 +87,13 @@ try:
     
     # Only import functions that ACTUALLY exist in su4_branching.py
     racah_su4_to_st = su4_branching.racah_su4_to_st
+    as_fractions = su4_branching.as_fractions
+    racah_su4_to_st_table = su4_branching.racah_su4_to_st_table
+    shell_branching = su4_branching.shell_branching
+    cached_branching = su4_branching.cached_branching
     
-    __all__ = ['racah_su4_to_st']
+    __all__ = ['racah_su4_to_st', 'as_fractions', 'racah_su4_to_st_table',
+               'shell_branching', 'cached_branching']
     
 except ImportError as e:
     print(f"Warning: Could not import su4_branching: {e}")
@@ -222,8 +225,8 @@ def create_package_structure(project_dir):
     print_success(f"Created directory: {package_path}")
 
 
-def install_package(project_dir):
-    """Install the package with modern pip settings"""
+def install_package(project_dir, missing=()):
+    """Install the package, plus any missing dependencies, in a single pip run"""
     print_header("Installing package")
     
     project_path = Path(project_dir)
@@ -232,13 +235,9 @@ def install_package(project_dir):
     print_info(f"Working directory: {os.getcwd()}")
     
     try:
-        print_info("Running: pip install --use-pep517 -e .")
-        subprocess.check_call([
-            sys.executable, "-m", "pip", 
-            "install", 
-            "--use-pep517",
-            "-e", "."
-        ])
+        pip_args = ["install", "--use-pep517", *missing, "-e", "."]
+        print_info(f"Running: pip {' '.join(pip_args)}")
+        subprocess.check_call([sys.executable, "-m", "pip"] + pip_args)
         print_success("✓ Package installed successfully!")
         return True
     except subprocess.CalledProcessError as e:
@@ -272,7 +271,7 @@ def print_directory_structure(project_dir):
 ├── su4_cli.py                    ← Terminal CLI (in project root)
 ├── su4branching_test.ipynb       ← Jupyter notebook (in project root)
 └── su4_branching/                ← Python package
-    ├── __init__.py               ← CORRECT (only imports racah_su4_to_st)
+    ├── __init__.py               ← CORRECT (re-exports racah_su4_to_st and helpers)
     ├── su4_branching.py
     └── su4_export.py
 
@@ -319,7 +318,7 @@ def main():
     
     # Step 2: Check dependencies
     print_header("Step 1: Checking Dependencies")
-    check_dependencies()
+    missing = check_dependencies()
     
     # Step 3: Specify project directory
     print_header("Step 2: Project Directory")
@@ -341,7 +340,7 @@ def main():
     
     # Step 5: Install package
     print_header("Step 4: Installation")
-    if not install_package(project_dir):
+    if not install_package(project_dir, missing):
         print_error("Installation failed!")
         sys.exit(1)
     
@@ -6,149 +6,642 @@ representations into SU(2)×SU(2) (spin-isospin) representations.
 Module conversion and enhancements added
 
 Functions:
-    racah_su4_to_st(f1, f2, f3, f4, verbose=True): Main function returning both DataFrames
+    racah_su4_to_st(f1, f2, f3, f4, verbose=True, return_type="dataframe"): Main function returning both DataFrames
+    racah_su4_to_st_batch(tableaux, verbose=False, workers=None): Parallel version for many tableaux
+    racah_su4_to_st_table(tableaux, verbose=False): Long-format branching table for many tableaux
+    load_shell_table(shell): Precomputed branching table of the sd or pf shell
+    cached_branching(f1, f2, f3, f4): racah_su4_to_st backed by an on-disk cache
     RacahSU4toST(f1, f2, f3, f4): Legacy function for backward compatibility
 """
 
-import pandas as pd
-import numpy as np
+from collections import namedtuple
 from fractions import Fraction
+from pathlib import Path
+import functools
+import os
 import sys
 
-def racah_su4_to_st(f1, f2, f3, f4, verbose=True):
+def _compute_st_table(p1_x2, p2_x2, p3_x2, min_st_x2, max_st_x2, S_x2, T_x2, mult):
+    """
+    Numeric kernel of racah_su4_to_st.
+    
+    All quantum numbers are passed in doubled units (2*p, 2*S, 2*T) so the
+    whole calculation is integer arithmetic. Every (S, T) with non-zero
+    multiplicity is written into the preallocated int64 arrays S_x2, T_x2
+    and mult; the number of rows written is returned.
+    """
+    def Q(x):
+        """Q helper for WTS in doubled units: returns Q(x/2)"""
+        if (x > 0):
+            return (x*x) // 16
+        return 0
+    
+    def WTS(w1, w2, T, S):
+        """Twice the weight multiplicity function"""
+        if (2*T <= w1 + w2 and 2*S <= w1 + w2 and w1 >= w2):
+            d = abs(T - S)
+            return (2*Q(w2+4-d) - 2*Q(w2+2-T-S) +
+                    2*Q(T+S-w1-2) - Q(T+S-d-w1+w2+2))
+        return 0
+    
+    a3 = abs(p3_x2)
+    k = 0
+    for S in range(min_st_x2, max_st_x2+1, 2):
+        for T in range(min_st_x2, max_st_x2+1, 2):
+            m = (WTS(p1_x2+a3, p1_x2-a3, T, S) -
+                 WTS(p1_x2+p2_x2+2, p1_x2-p2_x2-2, T, S) -
+                 WTS(p2_x2+a3-2, p2_x2-a3-2, T, S)) // 2
+            if (m != 0):
+                S_x2[k] = S
+                T_x2[k] = T
+                mult[k] = m
+                k += 1
+    return k
+
+
+_st_kernel = None
+
+
+def _get_st_kernel():
+    """Return _compute_st_table compiled with numba, or None if numba is not installed"""
+    global _st_kernel
+    if _st_kernel is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _st_kernel = False
+        else:
+            _st_kernel = njit(cache=True)(_compute_st_table)
+    return _st_kernel or None
+
+
+_display = None
+
+
+def _get_display():
+    """Return IPython's display if available, else a plain-text printer (probed once)"""
+    global _display
+    if _display is None:
+        try:
+            from IPython.display import display
+        except ImportError:
+            def display(df):
+                print(df.to_string())
+        _display = display
+    return _display
+
+
+def as_fractions(df, columns):
+    """Return a display copy of df with half-integer columns shown as fractions"""
+    view = df.copy()
+    for col in columns:
+        if view[col].dtype.kind == 'f':
+            view[col] = [Fraction(int(2*x), 2) for x in view[col]]
+    return view
+
+
+def format_su4_row(row):
+    """
+    Format one row of the SU(4) info DataFrame in bracket notation.
+    
+    The row is a column -> value mapping, e.g. su4_df.to_dict("records")[0].
+    
+    Example: [2 1 0 0] (3/2,1/2,1/2) (1,1,0) C_2[SU(4)] = 39.0, dimension = 20
+    """
+    p = ",".join(str(Fraction(int(2*row[col]), 2)) for col in ("p1", "p2", "p3"))
+    return (f"[{row['f1']} {row['f2']} {row['f3']} {row['f4']}] ({p}) "
+            f"({row['α']},{row['β']},{row['γ']}) "
+            f"C_2[SU(4)] = {row['C_2[SU(4)]']}, dimension = {row['dimension']}")
+
+
+@functools.lru_cache(maxsize=8192)
+def dimsu4(f1, f2, f3, f4):
+    """Calculate SU(4) irrep dimension"""
+    return (f1-f2+1)*(f1-f3+2)*(f1-f4+3)*(f2-f3+1)*(f2-f4+2)*(f3-f4+1)/12.
+
+
+def dimST(S, T, mult):
+    """Calculate SU(2)×SU(2) irrep dimension"""
+    return (2.*S + 1.) * (2.*T + 1.) * mult
+
+
+@functools.lru_cache(maxsize=8192)
+def cas2su4(alpha, beta, gamma):
+    """Calculate second-order Casimir invariant"""
+    casimir = (3*alpha*(alpha+4)
+           + 4*beta*(beta+4)
+           + 3*gamma*(gamma+4)
+           + 4*beta*(alpha+gamma)
+           + 2*alpha*gamma)
+    return float(casimir)
+
+
+def Q(x):
+    """Helper function for WTS calculation, in doubled units: returns Q(x/2)"""
+    import numpy as np
+    
+    return np.where(x > 0, (x*x) // 16, 0)
+
+
+def WTS(w1, w2, T, S):
+    """Twice the weight multiplicity function; all arguments in doubled units"""
+    import numpy as np
+    
+    d = np.abs(T - S)
+    result = (2*Q(w2+4-d) - 2*Q(w2+2-T-S) + 
+              2*Q(T+S-w1-2) - Q(T+S-d-w1+w2+2))
+    return np.where((2*T <= w1 + w2) & (2*S <= w1 + w2) & (w1 >= w2), result, 0)
+
+
+def Multi(p1, p2, p3, T, S):
+    """Calculate multiplicity; all arguments in doubled units (2p, 2T, 2S)"""
+    return (WTS(p1+abs(p3), p1-abs(p3), T, S) - 
+            WTS(p1+p2+2, p1-p2-2, T, S) - 
+            WTS(p2+abs(p3)-2, p2-abs(p3)-2, T, S)) // 2
+
+
+ST_COLUMNS = ("Spin", "Isospin", "mult", "dim (S,T)", "cum_sum_dim(S,T)")
+
+
+def _young_tableau(f1, f2, f3, f4):
+    """Return (f1, f2, f3, f4) as Python ints; integral floats such as 2.0 are accepted"""
+    tableau = (f1, f2, f3, f4)
+    try:
+        ints = tuple(int(f) for f in tableau)
+    except (TypeError, ValueError, OverflowError):
+        ints = None
+    if ints is None or ints != tableau:
+        raise ValueError(f"Young tableau entries must be integers, got {list(tableau)}")
+    return ints
+
+
+def _branching_columns(f1, f2, f3, f4):
+    """Validate the Young tableau and return the (S, T) branching table as a dict of NumPy columns"""
+    import numpy as np
+    
+    # Validate Young tableau conditions
+    if (f4 > f3) or (f3 > f2) or (f2 > f1):
+        raise ValueError("Young tableau condition violated: f1 ≥ f2 ≥ f3 ≥ f4 required")
+    
+    # Alternative notation (p1, p2, p3), in doubled units (exact integers)
+    p1_x2 = f1 + f2 - f3 - f4
+    p2_x2 = f1 - f2 + f3 - f4
+    p3_x2 = f1 - f2 - f3 + f4
+    
+    # S and T run over max(p1, p2), ..., 1/2 or 0 in steps of one
+    max_st_x2 = max(p1_x2, p2_x2)
+    min_st_x2 = p1_x2 % 2
+    
+    kernel = _get_st_kernel()
+    if kernel is not None:
+        # Compiled integer kernel
+        n = (max_st_x2 - min_st_x2) // 2 + 1
+        S_x2, T_x2, mult_col = (np.empty(n*n, dtype=np.int64) for _ in range(3))
+        k = kernel(p1_x2, p2_x2, p3_x2, min_st_x2, max_st_x2, S_x2, T_x2, mult_col)
+        S_x2, T_x2, mult_col = S_x2[:k], T_x2[:k], mult_col[:k]
+    else:
+        # Calculate ST branching rules over the whole (S, T) grid at once
+        st_values = np.arange(min_st_x2, max_st_x2+1, 2)
+        S_arr, T_arr = np.meshgrid(st_values, st_values, indexing='ij')
+        
+        mult = Multi(p1_x2, p2_x2, p3_x2, T_arr, S_arr)
+        mask = (mult != 0)
+        S_x2, T_x2, mult_col = S_arr[mask], T_arr[mask], mult[mask]
+    
+    # Back to physical units: integer spins stay integer, half-integers become float
+    if (min_st_x2 == 0):
+        S_col, T_col = S_x2 // 2, T_x2 // 2
+    else:
+        S_col, T_col = S_x2 / 2., T_x2 / 2.
+    dim_st = dimST(S_col, T_col, mult_col).astype(int)
+    
+    return {
+        "Spin": S_col,
+        "Isospin": T_col,
+        "mult": mult_col,
+        "dim (S,T)": dim_st,
+        "cum_sum_dim(S,T)": np.cumsum(dim_st),
+    }
+
+
+@functools.lru_cache(maxsize=4096)
+def _racah_su4_to_st_cached(f1, f2, f3, f4):
+    """Memoized core of racah_su4_to_st; the returned dicts and arrays must not be modified"""
+    f1, f2, f3, f4 = _young_tableau(f1, f2, f3, f4)
+    st_columns = _branching_columns(f1, f2, f3, f4)
+    return _su4_info(f1, f2, f3, f4), st_columns
+
+
+def _su4_info(f1, f2, f3, f4):
+    """SU(4) representation info row (labels, Casimir, dimension) as a dict"""
+    # Alternative notation (alpha, beta, gamma)
+    alpha = f1 - f2
+    beta = f2 - f3
+    gamma = f3 - f4
+    
+    su4_info = {
+        "f1": int(f1), "f2": int(f2), "f3": int(f3), "f4": int(f4),
+        "p1": (f1 + f2 - f3 - f4) / 2.0,
+        "p2": (f1 - f2 + f3 - f4) / 2.0,
+        "p3": (f1 - f2 - f3 + f4) / 2.0,
+        "α": alpha, "β": beta, "γ": gamma,
+        "C_2[SU(4)]": cas2su4(alpha, beta, gamma),
+        "dimension": int(dimsu4(f1, f2, f3, f4)),
+    }
+    
+    return su4_info
+
+
+BranchingArrays = namedtuple("BranchingArrays", ["su4_info", "st_columns"])
+
+
+def racah_su4_to_st(f1, f2, f3, f4, verbose=True, return_type="dataframe"):
     """
     Compute SU(4) to SU(2)×SU(2) branching rules for given Young tableau.
     
     Parameters:
     -----------
     f1, f2, f3, f4 : int
-        Young tableau parameters (must satisfy f1 ≥ f2 ≥ f3 ≥ f4)
+        Young tableau parameters (must satisfy f1 ≥ f2 ≥ f3 ≥ f4); integral
+        floats such as 2.0 are accepted
     verbose : bool, default=True
         If True, prints formatted output. If False, returns DataFrames silently.
+    return_type : {"dataframe", "arrays", "namedtuple"}, default="dataframe"
+        "dataframe" returns two DataFrames. "arrays" skips pandas and returns
+        (su4_info, st_columns): a dict of scalars and a dict of NumPy columns
+        with the same keys as the DataFrame columns. "namedtuple" returns the
+        same pair as a BranchingArrays namedtuple.
     
+    Returns:
+    --------
     tuple of (pd.DataFrame, pd.DataFrame)
         - SU(4) representation information DataFrame
         - ST branching rules DataFrame
+        (or the dict pair described under return_type)
+    
+    Results are memoized per Young tableau; every call returns fresh copies
+    of the cached data, so callers may modify them freely.
     
     Raises:
     -------
     ValueError
-        If Young tableau conditions are not satisfied
+        If Young tableau conditions are not satisfied, an entry is not an
+        integer, or return_type is unknown
     
     Examples:
     ---------
     >>> su4_info, st_branching = racah_su4_to_st(2, 1, 1, 0)
     >>> su4_info, st_branching = racah_su4_to_st(3, 2, 1, 0, verbose=False)
+    >>> su4_info, st_columns = racah_su4_to_st(3, 2, 1, 0, verbose=False, return_type="arrays")
+    >>> racah_su4_to_st(2.0, 1.0, 0.0, 0.0, verbose=False)[1].equals(
+    ...     racah_su4_to_st(2, 1, 0, 0, verbose=False)[1])
+    True
     """
+    if return_type not in ("dataframe", "arrays", "namedtuple"):
+        raise ValueError(f"Unknown return_type {return_type!r}: "
+                         "expected 'dataframe', 'arrays' or 'namedtuple'")
     
-    # Validate Young tableau conditions
-    if (f4 > f3) or (f3 > f2) or (f2 > f1):
-        raise ValueError("Young tableau condition violated: f1 ≥ f2 ≥ f3 ≥ f4 required")
+    su4_info, st_columns = _racah_su4_to_st_cached(f1, f2, f3, f4)
+    su4_info = dict(su4_info)
+    st_columns = {name: col.copy() for name, col in st_columns.items()}
     
-    # Alternative notation (alpha, beta, gamma)
-    alpha = f1 - f2
-    beta = f2 - f3
-    gamma = f3 - f4
-    
-    # Alternative notation (p1, p2, p3)
-    p1 = (f1 + f2 - f3 - f4) / 2.0
-    p2 = (f1 - f2 + f3 - f4) / 2.0
-    p3 = (f1 - f2 - f3 + f4) / 2.0
-    
-    max_st = max(p1, p2)
-    
-    def dimsu4(f1, f2, f3, f4):
-        """Calculate SU(4) irrep dimension"""
-        return (f1-f2+1)*(f1-f3+2)*(f1-f4+3)*(f2-f3+1)*(f2-f4+2)*(f3-f4+1)/12.
-    
-    def dimST(S, T, mult):
-        """Calculate SU(2)×SU(2) irrep dimension"""
-        return (2.*S + 1.) * (2.*T + 1.) * mult
-    
-    def cas2su4(alpha, beta, gamma):
-        """Calculate second-order Casimir invariant"""
-        casimir = (3*alpha*(alpha+4)
-               + 4*beta*(beta+4)
-               + 3*gamma*(gamma+4)
-               + 4*beta*(alpha+gamma)
-               + 2*alpha*gamma)
-        return float(casimir)
-    # Create SU(4) irrep information
-    SU4_irrep = []
-    SU4_irrep.append([
-        "[", int(f1), int(f2), int(f3), int(f4), "]",
-        "(", Fraction(p1), Fraction(p2), Fraction(p3), ")",
-        "(", alpha, beta, gamma, ")",
-        float(cas2su4(alpha, beta, gamma)),
-        int(dimsu4(f1, f2, f3, f4))
-    ])
-    
-    # Determine minimum S,T values
-    if ((2*p1) % 2 == 0):
-        min_st = 0.0
-    else:
-        min_st = 0.5
-    
-    def Q(x):
-        """Helper function for WTS calculation"""
-        if (x > 0):
-            return int(x**2 / 4.)
-        else:
-            return 0.0
-    
-    def WTS(w1, w2, T, S):
-        """Weight multiplicity function"""
-        w12 = (w1 + w2) / 2.
-        if (T <= w12 and S <= w12 and w1 >= w2):
-            result = (Q(w2+2-abs(T-S)) - Q(w2+1-T-S) + 
-                     Q(T+S-w1-1) - Q(T+S-abs(T-S)-w1+w2+1)/2.)
-        else:
-            result = 0.0
-        return result
-    
-    def Multi(p1, p2, p3, T, S):
-        """Calculate multiplicity"""
-        return (WTS(p1+abs(p3), p1-abs(p3), T, S) - 
-                WTS(p1+p2+1, p1-p2-1, T, S) - 
-                WTS(p2+abs(p3)-1, p2-abs(p3)-1, T, S))
-    
-    # Calculate ST branching rules
-    ST_irreps = []
-    sum_dim_st = 0.0
-    
-    if (min_st == 0):
-        for S in range(int(min_st), int(max_st)+1, +1):
-            for T in range(int(min_st), int(max_st)+1, +1):
-                mult = Multi(p1, p2, p3, T, S)
-                if (mult != 0):
-                    dim_st = int(dimST(S, T, mult))
-                    sum_dim_st = sum_dim_st + dimST(S, T, mult)
-                    ST_irreps.append([S, T, int(mult), int(dim_st), int(sum_dim_st)])
-    else:
-        for S in range(int(min_st*2), int(max_st*2)+2, +2):
-            for T in range(int(min_st*2), int(max_st*2)+2, +2):
-                mult = Multi(p1, p2, p3, T/2., S/2.)
-                dim_st = int(dimST(S/2., T/2., mult))
-                sum_dim_st = sum_dim_st + dimST(S/2., T/2., mult)
-                if (mult != 0):
-                    ST_irreps.append([Fraction(S/2.), Fraction(T/2.), int(mult), 
-                                    int(dim_st), int(sum_dim_st)])
-    
-    # Create DataFrames
-    su4_df = pd.DataFrame(np.array(SU4_irrep), 
-                         columns=["[", "f1", "f2", "f3", "f4", "]", "(", "p1", "p2", "p3", ")", 
-                                "(", "α", "β", "γ", ")", "C_2[SU(4)]", "dimension"])
-    
-    irreps_df = pd.DataFrame(np.array(ST_irreps), 
-                           columns=["Spin", "Isospin", "mult", "dim (S,T)", "cum_sum_dim(S,T)"])
+    if return_type == "dataframe" or verbose:
+        import pandas as pd
+        su4_df = pd.DataFrame([su4_info])
+        irreps_df = pd.DataFrame(st_columns)
     
     # Print output if verbose
     if verbose:
         print("● SU(4) Representation Info:(irrep notations, casimir order two, irrep dimension)")
-        display(su4_df)
+        print(format_su4_row(su4_info))
         print("\n● Branching Rules to (S, T):")
-        display(irreps_df)
+        _get_display()(as_fractions(irreps_df, ["Spin", "Isospin"]))
+    
+    if return_type == "arrays":
+        return su4_info, st_columns
+    if return_type == "namedtuple":
+        return BranchingArrays(su4_info, st_columns)
+    return su4_df, irreps_df
+
+
+def _racah_su4_to_st_quiet(tableau):
+    """Process-pool worker: racah_su4_to_st for one (f1, f2, f3, f4) tuple"""
+    return racah_su4_to_st(*tableau, verbose=False)
+
+
+def racah_su4_to_st_batch(tableaux, verbose=False, workers=None):
+    """
+    Compute the branching rules for many Young tableaux in parallel.
+    
+    Every tableau is independent, so the calculations are spread over a
+    process pool (processes rather than threads, since the work is
+    CPU-bound Python code).
+    
+    Parameters:
+    -----------
+    tableaux : iterable of tuples
+        (f1, f2, f3, f4) Young tableau parameters
+    verbose : bool, default=False
+        If True, prints one summary line per tableau
+    workers : int, optional
+        Number of worker processes (default: os.cpu_count())
+    
+    Returns:
+    --------
+    list of (pd.DataFrame, pd.DataFrame)
+        racah_su4_to_st results, in the same order as tableaux
+    
+    Examples:
+    ---------
+    >>> results = racah_su4_to_st_batch([(2, 1, 1, 0), (3, 2, 1, 0)])
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    tableaux = [tuple(t) for t in tableaux]
+    
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        results = list(ex.map(_racah_su4_to_st_quiet, tableaux, chunksize=16))
+    
+    if verbose:
+        for tableau, (su4_df, irreps_df) in zip(tableaux, results):
+            print(f"[{', '.join(map(str, tableau))}]: {len(irreps_df)} (S, T) multiplets")
+    
+    return results
+
+
+def racah_su4_to_st_table(tableaux, verbose=False):
+    """
+    Compute the branching rules for many Young tableaux as one long-format table.
+    
+    The (S, T) columns of every tableau are accumulated in flat int64
+    array buffers and the DataFrame is built once at the end, instead of
+    constructing a pair of DataFrames per tableau.
+    
+    Parameters:
+    -----------
+    tableaux : iterable of tuples
+        (f1, f2, f3, f4) Young tableau parameters
+    verbose : bool, default=False
+        If True, displays the resulting table
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Columns f1, f2, f3, f4 followed by the racah_su4_to_st branching
+        columns (Spin, Isospin, mult, dim (S,T), cum_sum_dim(S,T)); one row
+        per (S, T) multiplet of each tableau
+    
+    Examples:
+    ---------
+    >>> table = racah_su4_to_st_table([(2, 1, 1, 0), (3, 2, 1, 0)])
+    >>> table.groupby(["f1", "f2", "f3", "f4"])["dim (S,T)"].sum()
+    """
+    import array
+    import numpy as np
+    import pandas as pd
+    
+    labels = ("f1", "f2", "f3", "f4")
+    # int64 column buffers; Spin and Isospin are stored in doubled units
+    buffers = {name: array.array('q') for name in labels + ST_COLUMNS}
+    
+    for tableau in tableaux:
+        st_columns = _racah_su4_to_st_cached(*tableau)[1]
+        n_rows = len(st_columns["mult"])
+        for name, value in zip(labels, tableau):
+            buffers[name].extend(array.array('q', [int(value)]) * n_rows)
+        for name in ST_COLUMNS:
+            col = st_columns[name]
+            if name in ("Spin", "Isospin"):
+                col = 2*col
+            buffers[name].frombytes(np.asarray(col, dtype=np.int64).tobytes())
+    
+    columns = {name: np.frombuffer(buf, dtype=np.int64) for name, buf in buffers.items()}
+    for name in ("Spin", "Isospin"):
+        x2 = columns[name]
+        columns[name] = x2 // 2 if not (x2 % 2).any() else x2 / 2.
+    
+    table = pd.DataFrame(columns)
+    
+    if verbose:
+        _get_display()(as_fractions(table, ["Spin", "Isospin"]))
+    
+    return table
+
+
+# Number of spatial orbitals of the shells with precomputed branching tables
+SHELL_ORBITALS = {"sd": 6, "pf": 10}
+
+# Bump when the stored table layout or the branching algorithm changes
+_CACHE_VERSION = 1
+
+
+def _cache_dir():
+    """Directory for precomputed branching data (~/.cache/su4-branching by default)"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "su4-branching"
+
+
+def _shell_table_path(shell, cache_dir=None):
+    """Location of the precomputed .npz table for a shell"""
+    if shell not in SHELL_ORBITALS:
+        raise ValueError(f"Unknown shell {shell!r}: expected one of {sorted(SHELL_ORBITALS)}")
+    cache_dir = _cache_dir() if cache_dir is None else Path(cache_dir)
+    return cache_dir / f"su4_{shell}_shell_v{_CACHE_VERSION}.npz"
+
+
+def _save_npz(path, columns):
+    """Store a dict of arrays as .npz via a temporary file, so readers never see a partial file"""
+    import numpy as np
+    
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **columns)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _load_npz(path, names):
+    """The named arrays stored in an .npz file, or None if it is missing, truncated or corrupt"""
+    import zipfile
+    import numpy as np
+    
+    try:
+        with np.load(path) as data:
+            return {name: data[name] for name in names}
+    except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+
+
+def shell_su4_irreps(shell):
+    """
+    List the simplified SU(4) irreps [f1, f2, f3, 0] reachable in a shell.
+    
+    A U(n) Young diagram allowed by the Pauli principle (first row ≤ 4)
+    conjugates to an SU(4) irrep with f1 ≤ n; removing full columns sets f4 = 0.
+    
+    Parameters:
+    -----------
+    shell : str
+        "sd" (U(6)) or "pf" (U(10))
+    
+    Returns:
+    --------
+    list of tuples
+        (f1, f2, f3, 0), in lexicographic order
+    """
+    if shell not in SHELL_ORBITALS:
+        raise ValueError(f"Unknown shell {shell!r}: expected one of {sorted(SHELL_ORBITALS)}")
+    n = SHELL_ORBITALS[shell]
+    return [(f1, f2, f3, 0)
+            for f1 in range(n + 1)
+            for f2 in range(f1 + 1)
+            for f3 in range(f2 + 1)]
+
+
+def precompute_shell_tables(shells=("sd", "pf"), cache_dir=None):
+    """
+    Compute the branching table of every irrep in each shell and store it as .npz.
+    
+    Parameters:
+    -----------
+    shells : iterable of str, default ("sd", "pf")
+        Shells to precompute
+    cache_dir : str or Path, optional
+        Output directory (default: ~/.cache/su4-branching)
+    
+    Returns:
+    --------
+    dict
+        Mapping shell -> path of the written table
+    """
+    paths = {}
+    for shell in shells:
+        path = _shell_table_path(shell, cache_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = racah_su4_to_st_table(shell_su4_irreps(shell))
+        _save_npz(path, {name: table[name].to_numpy() for name in table.columns})
+        paths[shell] = path
+    return paths
+
+
+def load_shell_table(shell, cache_dir=None):
+    """
+    Load the precomputed long-format branching table of a shell.
+    
+    The table is computed and stored on first use (see
+    precompute_shell_tables), so later calls are a single file read. A
+    truncated or corrupt file is recomputed and replaced.
     
+    Parameters:
+    -----------
+    shell : str
+        "sd" (U(6)) or "pf" (U(10))
+    cache_dir : str or Path, optional
+        Directory of the stored tables (default: ~/.cache/su4-branching)
+    
+    Returns:
+    --------
+    pd.DataFrame
+        Same layout as racah_su4_to_st_table
+    """
+    import pandas as pd
+    
+    path = _shell_table_path(shell, cache_dir)
+    columns = _load_npz(path, ("f1", "f2", "f3", "f4") + ST_COLUMNS)
+    if columns is not None:
+        return pd.DataFrame(columns)
+    
+    # Missing or unreadable file: compute the table and (re)store it
+    table = racah_su4_to_st_table(shell_su4_irreps(shell))
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _save_npz(path, {name: table[name].to_numpy() for name in table.columns})
+    except OSError:
+        pass  # read-only cache location: the table is still returned
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def _shell_index(shell, cache_dir=None):
+    """Memoized shell table split per irrep: (f1, f2, f3, f4) -> ST DataFrame; do not modify"""
+    table = load_shell_table(shell, cache_dir)
+    index = {}
+    for key, rows in table.groupby(["f1", "f2", "f3", "f4"], sort=False):
+        irreps_df = rows[list(ST_COLUMNS)].reset_index(drop=True)
+        if (irreps_df["Spin"] % 1 == 0).all():
+            irreps_df = irreps_df.astype({"Spin": int, "Isospin": int})
+        index[tuple(int(f) for f in key)] = irreps_df
+    return index
+
+
+def shell_branching(shell, f1, f2, f3, f4, cache_dir=None):
+    """
+    Return the ST branching DataFrame of an irrep, read from the shell table.
+    
+    The shell table is loaded and indexed by irrep once per (shell,
+    cache_dir); irreps that are not in it are computed directly with
+    racah_su4_to_st.
+    
+    Parameters:
+    -----------
+    shell : str
+        "sd" (U(6)) or "pf" (U(10))
+    f1, f2, f3, f4 : int
+        Young tableau parameters (must satisfy f1 ≥ f2 ≥ f3 ≥ f4)
+    cache_dir : str or Path, optional
+        Directory of the stored tables (default: ~/.cache/su4-branching)
+    
+    Returns:
+    --------
+    pd.DataFrame
+        ST branching rules DataFrame, as returned by racah_su4_to_st
+    """
+    irreps_df = _shell_index(shell, cache_dir).get((f1, f2, f3, f4))
+    if irreps_df is None:
+        return racah_su4_to_st(f1, f2, f3, f4, verbose=False)[1]
+    return irreps_df.copy()
+
+
+def cached_branching(f1, f2, f3, f4, cache_dir=None):
+    """
+    racah_su4_to_st(f1, f2, f3, f4, verbose=False) backed by an on-disk cache.
+    
+    The (S, T) table of each irrep is stored as .npz under
+    ~/.cache/su4-branching/irreps, so separate runs (e.g. repeated CLI calls
+    in a shell loop) read it back instead of recomputing it. A truncated or
+    corrupt file counts as a cache miss and is rewritten.
+    
+    Parameters:
+    -----------
+    f1, f2, f3, f4 : int
+        Young tableau parameters (must satisfy f1 ≥ f2 ≥ f3 ≥ f4)
+    cache_dir : str or Path, optional
+        Cache directory (default: ~/.cache/su4-branching)
+    
+    Returns:
+    --------
+    tuple of (pd.DataFrame, pd.DataFrame)
+        Same as racah_su4_to_st(f1, f2, f3, f4, verbose=False)
+    """
+    import pandas as pd
+    
+    f1, f2, f3, f4 = _young_tableau(f1, f2, f3, f4)
+    cache_dir = _cache_dir() if cache_dir is None else Path(cache_dir)
+    path = cache_dir / "irreps" / f"{f1}_{f2}_{f3}_{f4}_v{_CACHE_VERSION}.npz"
+    
+    st_columns = _load_npz(path, ST_COLUMNS)
+    if st_columns is not None:
+        return pd.DataFrame([_su4_info(f1, f2, f3, f4)]), pd.DataFrame(st_columns)
+    
+    # Missing or unreadable file: compute the table and (re)store it
+    su4_df, irreps_df = racah_su4_to_st(f1, f2, f3, f4, verbose=False)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _save_npz(path, {name: irreps_df[name].to_numpy() for name in ST_COLUMNS})
+    except OSError:
+        pass  # read-only cache location: the result is still returned
     return su4_df, irreps_df
 
 
@@ -211,7 +704,7 @@ def get_su4_dimension(f1, f2, f3, f4):
     if not validate_young_tableau(f1, f2, f3, f4):
         raise ValueError("Invalid Young tableau")
     
-    return int((f1-f2+1)*(f1-f3+2)*(f1-f4+3)*(f2-f3+1)*(f2-f4+2)*(f3-f4+1)/12.)
+    return int(dimsu4(f1, f2, f3, f4))
 
 
 def get_casimir_su4(f1, f2, f3, f4):
@@ -231,9 +724,9 @@ def get_casimir_su4(f1, f2, f3, f4):
     if not validate_young_tableau(f1, f2, f3, f4):
         raise ValueError("Invalid Young tableau")
     
-        casimir = (3*alpha*(alpha+4)
-               + 4*beta*(beta+4)
-               + 3*gamma*(gamma+4)
-               + 4*beta*(alpha+gamma)
-               + 2*alpha*gamma)
-        return float(casimir) 
+    return cas2su4(f1 - f2, f2 - f3, f3 - f4)
+
+
+if __name__ == "__main__":
+    for shell, path in precompute_shell_tables().items():
+        print(f"{shell}-shell table written to {path}")
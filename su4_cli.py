@@ -10,131 +10,138 @@ Run from terminal: python su4_cli.py
 """
 
 import argparse
-import os, sys
+import functools
+import importlib
+import importlib.util
+import sys
+import traceback
 from pathlib import Path
 from typing import Tuple
-import numpy as np
 
-# Add module path
-module_path = os.path.abspath("/home/pvalen/su4-branching/su4_branching")
-if module_path not in sys.path:
-    sys.path.append(module_path)
+# Add module path only when su4_branching is not already importable
+# (e.g. pip-installed). Look for su4_branching.py in the su4_branching/
+# folder next to this script (README/installer layout), then beside it.
+if importlib.util.find_spec("su4_branching") is None:
+    _cli_dir = Path(__file__).resolve().parent
+    for _module_dir in (_cli_dir / "su4_branching", _cli_dir):
+        if (_module_dir / "su4_branching.py").is_file():
+            sys.path.insert(0, str(_module_dir))
+            break
+
+_su4_branching = None
+
+def _get_su4_branching():
+    """Import su4_branching on first use (keeps --help and start-up light)"""
+    global _su4_branching
+    if _su4_branching is None:
+        import su4_branching
+        # In the installer's package layout the functions live in the
+        # su4_branching.su4_branching submodule; the package __init__ may
+        # re-export only some of them (older installs: racah_su4_to_st only,
+        # manual installs: an empty file)
+        if hasattr(su4_branching, "__path__"):
+            su4_branching = importlib.import_module("su4_branching.su4_branching")
+        _su4_branching = su4_branching
+    return _su4_branching
 
 class SymmetryError(ValueError):
     """Exception for symmetry constraint violations"""
     pass
 
-def u6_to_su4_irrep(u6_irrep: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+def _cli_handler(func):
+    """Report unexpected errors of a run_* command (message and traceback) and return False"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            print(f"✗ Error: {e}")
+            traceback.print_exc()
+            return False
+    return wrapper
+
+_SUPERSCRIPT_DIGITS = str.maketrans("0123456789", "⁰¹²³⁴⁵⁶⁷⁸⁹")
+
+@functools.lru_cache(maxsize=4096)
+def _conjugate_simplified(irrep: Tuple[int, ...], n: int) -> Tuple[int, int, int, int]:
     """
-    Convert U(6) Young tableau to SU(4) irrep with proper validation and simplification.
+    Conjugate and simplify a validated U(n) Young tableau (see _to_su4).
     
-    Uses EXACT algorithm from Jupyter Notebook:
-    1. Validate input (6 elements, non-negative, non-increasing)
-    2. Check Pauli constraint: f1 <= 4
-    3. Compute conjugate partition (transpose Young diagram)
-    4. Simplify by removing columns of height 4 or greater
-    5. Return [f1, f2, f3, f4]
+    Memoized on the tableau tuple; validation stays in _to_su4 because equal
+    tuples such as (1, 0, ...) and (1.0, 0, ...) share a cache entry.
     """
-    # Validate input format and constraints
-    if len(u6_irrep) != 6 or any(not isinstance(x, int) or x < 0 for x in u6_irrep):
-        raise SymmetryError("Input must be 6 non-negative integers")
-    
-    if list(u6_irrep) != sorted(u6_irrep, reverse=True):
-        raise SymmetryError("Young diagram must be non-increasing sequence")
-        
-    # CHECK PAULI EXCLUSION PRINCIPLE CONSTRAINT on U(6) FIRST COLUMN: f1 <= 4
-    f1_u6 = u6_irrep[0]
-    
-    if f1_u6 > 4:
-        u6_label = "{" + ", ".join(map(str, u6_irrep)) + "}"
-        raise SymmetryError(
-            f"❌ PAULI EXCLUSION PRINCIPLE VIOLATED ❌\n"
-            f"   U(6) irrep: {u6_label}\n"
-            f"   f₁ᵁ⁽⁶⁾ = {f1_u6} > 4 NOT ALLOWED\n"
-            f"   First row of U(6) Young diagram cannot exceed 4 boxes\n"
-            f"   Physical reason: Cannot have >4 nucleons in same spatial state\n"
-            f"   (spin-isospin: 2 spin × 2 isospin = 4 quantum states per spatial orbital)"
-        )    
-    
-    # Compute conjugate partition (transpose Young diagram)
-    current = np.array(u6_irrep, dtype=np.int32)
-    su4_irrep = []
-    
-    while np.any(current > 0):
-        # Count non-zero elements in current column (height of column)
-        non_zero_count = np.count_nonzero(current)
-        su4_irrep.append(non_zero_count)
-        # Remove first column and decrement remaining elements
-        current = current[current > 0] - 1
-    
-    # Simplify SU(4) irrep by removing columns of length 4 or greater
-    while (len(su4_irrep) >= 4):
-        last_element = su4_irrep[-1]
-        su4_irrep = [x - last_element for x in su4_irrep[:-1]]
-
-    f1 = su4_irrep[0] if len(su4_irrep) > 0 else 0    
-    # Pad with zeros to ensure exactly 4 elements
-    su4_irrep.extend([0] * (4 - len(su4_irrep)))
-    
-    f1, f2, f3, f4 = tuple(int(x) for x in su4_irrep[:4])
-    
-    return f1, f2, f3, f4
+    f1_un = irrep[0]
+    
+    # Compute conjugate partition (transpose Young diagram):
+    # the height of column j is the number of rows with at least j boxes.
+    # With f1 <= 4 (checked in _to_su4) every row fits in a 4-bit lane; adding
+    # 8 - j to each lane sets its high bit iff the row has >= j boxes,
+    # so each column height is a single masked popcount.
+    packed = 0
+    for i, x in enumerate(irrep):
+        packed |= x << (4 * i)
+    lanes = ((1 << (4 * n)) - 1) // 15   # 0x...111: lowest bit of each lane
+    high_bits = lanes << 3
+    su4_irrep = [0, 0, 0, 0]
+    for j in range(1, f1_un + 1):
+        su4_irrep[j - 1] = bin((packed + (8 - j) * lanes) & high_bits).count("1")
+    
+    # Simplify SU(4) irrep by removing columns of length 4, i.e. subtracting
+    # the fourth row from every row (there are only 4 rows since f1 <= 4)
+    if f1_un == 4:
+        last_element = su4_irrep[3]
+        return (su4_irrep[0] - last_element, su4_irrep[1] - last_element,
+                su4_irrep[2] - last_element, 0)
+    
+    return tuple(su4_irrep)
 
-def u10_to_su4_irrep(u10_irrep: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+def _to_su4(irrep: Tuple[int, ...], n: int, space_label: str,
+            orbital_label: str) -> Tuple[int, int, int, int]:
     """
-    Convert U(10) Young tableau to SU(4) irrep with proper validation and simplification.
+    Convert a U(n) Young tableau to SU(4) irrep with proper validation and simplification.
     
-    Uses EXACT algorithm from Jupyter Notebook (adapted for U(10)):
-    1. Validate input (10 elements, non-negative, non-increasing)
+    Uses EXACT algorithm from Jupyter Notebook:
+    1. Validate input (n elements, non-negative, non-increasing)
     2. Check Pauli constraint: f1 <= 4
     3. Compute conjugate partition (transpose Young diagram)
     4. Simplify by removing columns of height 4 or greater
     5. Return [f1, f2, f3, f4]
+    
+    space_label ("U(6)", "U(10)") and orbital_label ("spatial", "pf") only
+    appear in error messages.
     """
-    # Validate input format and constraints
-    if len(u10_irrep) != 10 or any(not isinstance(x, int) or x < 0 for x in u10_irrep):
-        raise SymmetryError("Input must be 10 non-negative integers")
+    # Validate input format and constraints (argparse already delivers ints)
+    assert all(isinstance(x, int) for x in irrep), "Young diagram entries must be integers"
+    if len(irrep) != n or min(irrep) < 0:
+        raise SymmetryError(f"Input must be {n} non-negative integers")
     
-    if list(u10_irrep) != sorted(u10_irrep, reverse=True):
+    if any(a < b for a, b in zip(irrep, irrep[1:])):
         raise SymmetryError("Young diagram must be non-increasing sequence")
         
-    # CHECK PAULI EXCLUSION PRINCIPLE CONSTRAINT on U(10) FIRST COLUMN: f1 <= 4
-    f1_u10 = u10_irrep[0]
+    # CHECK PAULI EXCLUSION PRINCIPLE CONSTRAINT on U(n) FIRST COLUMN: f1 <= 4
+    f1_un = irrep[0]
     
-    if f1_u10 > 4:
-        u10_label = "{" + ", ".join(map(str, u10_irrep)) + "}"
+    if f1_un > 4:
+        un_label = "{" + ", ".join(map(str, irrep)) + "}"
+        un_superscript = "ᵁ⁽" + str(n).translate(_SUPERSCRIPT_DIGITS) + "⁾"
         raise SymmetryError(
             f"❌ PAULI EXCLUSION PRINCIPLE VIOLATED ❌\n"
-            f"   U(10) irrep: {u10_label}\n"
-            f"   f₁ᵁ⁽¹⁰⁾ = {f1_u10} > 4 NOT ALLOWED\n"
-            f"   First row of U(10) Young diagram cannot exceed 4 boxes\n"
+            f"   {space_label} irrep: {un_label}\n"
+            f"   f₁{un_superscript} = {f1_un} > 4 NOT ALLOWED\n"
+            f"   First row of {space_label} Young diagram cannot exceed 4 boxes\n"
             f"   Physical reason: Cannot have >4 nucleons in same spatial state\n"
-            f"   (spin-isospin: 2 spin × 2 isospin = 4 quantum states per pf orbital)"
+            f"   (spin-isospin: 2 spin × 2 isospin = 4 quantum states per {orbital_label} orbital)"
         )    
     
-    # Compute conjugate partition (transpose Young diagram)
-    current = np.array(u10_irrep, dtype=np.int32)
-    su4_irrep = []
-    
-    while np.any(current > 0):
-        # Count non-zero elements in current column (height of column)
-        non_zero_count = np.count_nonzero(current)
-        su4_irrep.append(non_zero_count)
-        # Remove first column and decrement remaining elements
-        current = current[current > 0] - 1
-    
-    # Simplify SU(4) irrep by removing columns of length 4 or greater
-    while (len(su4_irrep) >= 4):
-        last_element = su4_irrep[-1]
-        su4_irrep = [x - last_element for x in su4_irrep[:-1]]
+    return _conjugate_simplified(tuple(irrep), n)
 
-    f1 = su4_irrep[0] if len(su4_irrep) > 0 else 0    
-    # Pad with zeros to ensure exactly 4 elements
-    su4_irrep.extend([0] * (4 - len(su4_irrep)))
-    
-    f1, f2, f3, f4 = tuple(int(x) for x in su4_irrep[:4])
-    
-    return f1, f2, f3, f4
+def u6_to_su4_irrep(u6_irrep: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+    """Convert U(6) Young tableau (sd shell) to SU(4) irrep, see _to_su4"""
+    return _to_su4(u6_irrep, 6, "U(6)", "spatial")
+
+def u10_to_su4_irrep(u10_irrep: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+    """Convert U(10) Young tableau (pf shell) to SU(4) irrep, see _to_su4"""
+    return _to_su4(u10_irrep, 10, "U(10)", "pf")
 
 def u6_conjugate(u6_young):
     """Convert U(6) Young tableau to SU(4) (wrapper for Jupyter-style function)"""
@@ -144,13 +151,34 @@ def u10_conjugate(u10_young):
     """Convert U(10) Young tableau to SU(4) (wrapper for Jupyter-style function)"""
     return u10_to_su4_irrep(u10_young)
 
+MAX_TABLE_ROWS = 15
+
+def _with_fractions(st_df):
+    """Display copy of a branching table with half-integer spins shown as fractions"""
+    return _get_su4_branching().as_fractions(st_df, ["Spin", "Isospin"])
+
+def _print_table(st_df, all_rows=False):
+    """
+    Print a branching table: the first MAX_TABLE_ROWS rows formatted, or every
+    row streamed as tab-separated values when all_rows is set.
+    """
+    st_df = _with_fractions(st_df)
+    if all_rows:
+        st_df.to_csv(sys.stdout, sep="\t", index=False)
+        return
+    
+    print(st_df.head(MAX_TABLE_ROWS).to_string(index=False))
+    if len(st_df) > MAX_TABLE_ROWS:
+        print(f"... ({len(st_df) - MAX_TABLE_ROWS} more rows, use --all-rows to show them)")
+
+@_cli_handler
 def run_example_sd_shell():
     """Run example with sd-shell nuclei (U(6))"""
     print("\n" + "=" * 80)
     print("EXAMPLE: sd-shell nuclei (U(6) ⊗ SU(4))")
     print("=" * 80 + "\n")
     
-    import su4_branching
+    su4_branching = _get_su4_branching()
     
     u6_irrep = (2, 1, 1, 0, 0, 0)
     
@@ -161,22 +189,24 @@ def run_example_sd_shell():
     
     print(f"SU(4) irrep (simplified): [{f1}, {f2}, {f3}, {f4}]\n")
     
-    su4_df, st_df = su4_branching.racah_su4_to_st(
-        f1, f2, f3, f4, verbose=False
-    )
+    # Read from the precomputed sd-shell table
+    st_df = su4_branching.shell_branching("sd", f1, f2, f3, f4)
     
     print("Branching decomposition (S, T) multiplets:")
     print("-" * 80)
-    print(st_df.to_string(index=False))
+    print(_with_fractions(st_df).to_string(index=False))
     print("-" * 80 + "\n")
+    
+    return True
 
-def run_example_pf_shell():
+@_cli_handler
+def run_example_pf_shell(all_rows=False):
     """Run example with pf-shell nuclei (U(10))"""
     print("\n" + "=" * 80)
     print("EXAMPLE: pf-shell nuclei (U(10) ⊗ SU(4))")
     print("=" * 80 + "\n")
     
-    import su4_branching
+    su4_branching = _get_su4_branching()
     
     u10_irrep = (2, 2, 1, 1, 0, 0, 0, 0, 0, 0)
     
@@ -187,24 +217,24 @@ def run_example_pf_shell():
     
     print(f"SU(4) irrep (simplified): [{f1}, {f2}, {f3}, {f4}]\n")
     
-    su4_df, st_df = su4_branching.racah_su4_to_st(
-        f1, f2, f3, f4, verbose=False
-    )
+    # Read from the precomputed pf-shell table
+    st_df = su4_branching.shell_branching("pf", f1, f2, f3, f4)
     
     print(f"Branching decomposition ({len(st_df)} (S, T) multiplets):")
     print("-" * 80)
-    print(st_df.head(15).to_string(index=False))
-    if len(st_df) > 15:
-        print(f"... ({len(st_df) - 15} more rows)")
+    _print_table(st_df, all_rows)
     print("-" * 80 + "\n")
+    
+    return True
 
+@_cli_handler
 def run_custom_sd(u6_irrep):
     """Run custom sd-shell U(6) calculation with Pauli checking"""
     print("\n" + "=" * 80)
     print(f"CUSTOM SD-SHELL: U(6) irrep {u6_irrep}")
     print("=" * 80 + "\n")
     
-    import su4_branching
+    su4_branching = _get_su4_branching()
     
     # Convert U(6) to SU(4) (includes Pauli check and simplification)
     try:
@@ -212,9 +242,7 @@ def run_custom_sd(u6_irrep):
         print(f"Pauli check: f₁ = {u6_irrep[0]} ≤ 4 ✓")
         print(f"Converted to SU(4) irrep (simplified): [{f1}, {f2}, {f3}, {f4}]\n")
         
-        su4_df, st_df = su4_branching.racah_su4_to_st(
-            f1, f2, f3, f4, verbose=False
-        )
+        su4_df, st_df = su4_branching.cached_branching(f1, f2, f3, f4)
         
         try:
             total_dim = int(st_df['dim (S,T)'].sum())
@@ -224,7 +252,7 @@ def run_custom_sd(u6_irrep):
         
         print(f"\nBranching decomposition ({len(st_df)} (S, T) multiplets):")
         print("-" * 80)
-        print(st_df.to_string(index=False))
+        print(_with_fractions(st_df).to_string(index=False))
         print("-" * 80 + "\n")
         
     except SymmetryError as e:
@@ -233,13 +261,14 @@ def run_custom_sd(u6_irrep):
     
     return True
 
-def run_custom_pf(u10_irrep):
+@_cli_handler
+def run_custom_pf(u10_irrep, all_rows=False):
     """Run custom pf-shell U(10) calculation with Pauli checking"""
     print("\n" + "=" * 80)
     print(f"CUSTOM PF-SHELL: U(10) irrep {u10_irrep}")
     print("=" * 80 + "\n")
     
-    import su4_branching
+    su4_branching = _get_su4_branching()
     
     # Convert U(10) to SU(4) (includes Pauli check and simplification)
     try:
@@ -247,9 +276,7 @@ def run_custom_pf(u10_irrep):
         print(f"Pauli check: f₁ = {u10_irrep[0]} ≤ 4 ✓")
         print(f"Converted to SU(4) irrep (simplified): [{f1}, {f2}, {f3}, {f4}]\n")
         
-        su4_df, st_df = su4_branching.racah_su4_to_st(
-            f1, f2, f3, f4, verbose=False
-        )
+        su4_df, st_df = su4_branching.cached_branching(f1, f2, f3, f4)
         
         try:
             total_dim = int(st_df['dim (S,T)'].sum())
@@ -259,7 +286,7 @@ def run_custom_pf(u10_irrep):
         
         print(f"\nBranching decomposition ({len(st_df)} (S, T) multiplets):")
         print("-" * 80)
-        print(st_df.to_string(index=False))
+        _print_table(st_df, all_rows)
         print("-" * 80 + "\n")
         
     except SymmetryError as e:
@@ -268,17 +295,16 @@ def run_custom_pf(u10_irrep):
     
     return True
 
-def run_custom(f1, f2, f3, f4=0):
+@_cli_handler
+def run_custom(f1, f2, f3, f4=0, all_rows=False):
     """Run custom SU(4) irrep calculation"""
     print("\n" + "=" * 80)
     print(f"CUSTOM SU(4): irrep [{f1}, {f2}, {f3}, {f4}]")
     print("=" * 80 + "\n")
     
-    import su4_branching
+    su4_branching = _get_su4_branching()
     
-    su4_df, st_df = su4_branching.racah_su4_to_st(
-        f1, f2, f3, f4, verbose=False
-    )
+    su4_df, st_df = su4_branching.cached_branching(f1, f2, f3, f4)
     
     try:
         total_dim = int(st_df['dim (S,T)'].sum())
@@ -288,8 +314,10 @@ def run_custom(f1, f2, f3, f4=0):
     
     print(f"\nBranching decomposition ({len(st_df)} (S, T) multiplets):")
     print("-" * 80)
-    print(st_df.to_string(index=False))
+    _print_table(st_df, all_rows)
     print("-" * 80 + "\n")
+    
+    return True
 
 def main():
     """Main CLI interface"""
@@ -330,6 +358,10 @@ python su4_cli.py --custom-su4 8 5 5 0
     group.add_argument('--custom-su4', nargs='+', type=int, metavar='IRREP',
                        help='Custom SU(4): [f1 f2 f3 (f4)]')
     
+    parser.add_argument('--all-rows', action='store_true',
+                        help=f'Print every (S, T) row as tab-separated values '
+                             f'(default: first {MAX_TABLE_ROWS} rows of pf-shell and SU(4) tables)')
+    
     args = parser.parse_args()
     
     # Test mode
@@ -338,7 +370,7 @@ python su4_cli.py --custom-su4 8 5 5 0
         print("TESTING INSTALLATION")
         print("=" * 80 + "\n")
         try:
-            import su4_branching
+            _get_su4_branching()
             print("✓ su4_branching imported successfully")
             return 0
         except ImportError as e:
@@ -347,67 +379,30 @@ python su4_cli.py --custom-su4 8 5 5 0
     
     # SD-shell example
     if args.sd_shell:
-        try:
-            run_example_sd_shell()
-            return 0
-        except Exception as e:
-            print(f"✗ Error: {e}")
-            import traceback
-            traceback.print_exc()
-            return 1
+        return 0 if run_example_sd_shell() else 1
     
     # PF-shell example
     if args.pf_shell:
-        try:
-            run_example_pf_shell()
-            return 0
-        except Exception as e:
-            print(f"✗ Error: {e}")
-            import traceback
-            traceback.print_exc()
-            return 1
+        return 0 if run_example_pf_shell(all_rows=args.all_rows) else 1
     
     # Custom SD-shell
     if args.custom_sd:
-        try:
-            u6_irrep = tuple(args.custom_sd)
-            success = run_custom_sd(u6_irrep)
-            return 0 if success else 1
-        except Exception as e:
-            print(f"✗ Error: {e}")
-            import traceback
-            traceback.print_exc()
-            return 1
+        return 0 if run_custom_sd(tuple(args.custom_sd)) else 1
     
     # Custom PF-shell
     if args.custom_pf:
-        try:
-            u10_irrep = tuple(args.custom_pf)
-            success = run_custom_pf(u10_irrep)
-            return 0 if success else 1
-        except Exception as e:
-            print(f"✗ Error: {e}")
-            import traceback
-            traceback.print_exc()
-            return 1
+        return 0 if run_custom_pf(tuple(args.custom_pf), all_rows=args.all_rows) else 1
     
     # Custom SU(4)
     if args.custom_su4:
-        try:
-            if len(args.custom_su4) < 3 or len(args.custom_su4) > 4:
-                print("✗ SU(4) irrep requires 3 or 4 integers: [f1 f2 f3 (f4)]")
-                return 1
-            
-            f1, f2, f3 = args.custom_su4[:3]
-            f4 = args.custom_su4[3] if len(args.custom_su4) == 4 else 0
-            
-            run_custom(f1, f2, f3, f4)
-            return 0
-        except Exception as e:
-            print(f"✗ Error: {e}")
-            import traceback
-            traceback.print_exc()
+        if len(args.custom_su4) < 3 or len(args.custom_su4) > 4:
+            print("✗ SU(4) irrep requires 3 or 4 integers: [f1 f2 f3 (f4)]")
             return 1
+        
+        f1, f2, f3 = args.custom_su4[:3]
+        f4 = args.custom_su4[3] if len(args.custom_su4) == 4 else 0
+        
+        return 0 if run_custom(f1, f2, f3, f4, all_rows=args.all_rows) else 1
     
     return 0
 
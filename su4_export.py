@@ -6,9 +6,66 @@ Enhanced export functions for SU(4) branching data with representation labels.
 Creates separate CSV and LaTeX files with proper identification.
 """
 
+from fractions import Fraction
 from pathlib import Path
+import importlib
+import importlib.util
 import pandas as pd
 
+class ExportError(RuntimeError):
+    """Some representations of a batch export failed; carries the failures and the partial results"""
+    def __init__(self, failed, results):
+        self.failed = failed
+        self.results = results
+        details = "; ".join(f"[{','.join(map(str, irrep))}]: {error}" for irrep, error in failed.items())
+        super().__init__(f"{len(failed)} of {len(failed) + len(results)} "
+                         f"representations failed to export ({details})")
+
+def _half_integer_formatters(df, columns):
+    """to_latex formatters that print half-integer (float) columns as fractions"""
+    return {col: (lambda x: str(Fraction(x)))
+            for col in columns if df[col].dtype.kind == 'f'}
+
+def _half_integer_csv(df, columns):
+    """Copy of df for to_csv with half-integer (float) columns written as fractions (1/2, 3/2, 2)"""
+    return df.assign(**{col: df[col].map(lambda x: str(Fraction(x)))
+                        for col in columns if df[col].dtype.kind == 'f'})
+
+# LaTeX column layout of the (S,T) branching table (five integer columns)
+_ST_COLUMN_FORMAT = "|c|c|c|c|c|"
+
+def _fast_int_latex(df, caption, label, column_format=_ST_COLUMN_FORMAT):
+    """
+    Render an integer (or half-integer) table as a LaTeX table environment.
+    
+    Produces the same text as DataFrame.to_latex(index=False, escape=False,
+    position="htbp") with half-integer columns printed as fractions, but joins
+    the cells directly instead of going through pandas' per-cell formatters.
+    """
+    columns = [map(lambda x: str(Fraction(x)), df[col].tolist()) if df[col].dtype.kind == 'f'
+               else map(str, df[col].tolist())
+               for col in df.columns]
+    body = "".join(" & ".join(row) + " \\\\\n" for row in zip(*columns))
+    return (
+        "\\begin{table}[htbp]\n"
+        f"\\caption{{{caption}}}\n"
+        f"\\label{{{label}}}\n"
+        f"\\begin{{tabular}}{{{column_format}}}\n"
+        "\\toprule\n"
+        + " & ".join(df.columns) + " \\\\\n"
+        "\\midrule\n"
+        + body +
+        "\\bottomrule\n"
+        "\\end{tabular}\n"
+        "\\end{table}\n"
+    )
+
+def _branching_dataframes(su4_module, f1, f2, f3, f4):
+    """racah_su4_to_st(f1, f2, f3, f4, verbose=False) of su4_module, via its on-disk cache if it has one"""
+    if hasattr(su4_module, "cached_branching"):
+        return su4_module.cached_branching(f1, f2, f3, f4)
+    return su4_module.racah_su4_to_st(f1, f2, f3, f4, verbose=False)
+
 def export_su4_with_labels(f1: int, f2: int, f3: int, f4: int, 
                           su4_module,
                           out_dir: str | Path = ".",
@@ -32,25 +89,34 @@ def export_su4_with_labels(f1: int, f2: int, f3: int, f4: int,
     dict
         Dictionary with paths to generated files
     """
+    # Setup output directory
+    out_dir = Path(out_dir).expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    
+    return _export_su4_with_labels_prepared(f1, f2, f3, f4, su4_module, out_dir, verbose)[0]
+
+def _export_su4_with_labels_prepared(f1: int, f2: int, f3: int, f4: int,
+                                     su4_module,
+                                     out_dir: Path,
+                                     verbose: bool):
+    """
+    export_su4_with_labels for an out_dir that is already resolved and created.
+    
+    Returns the files dict together with the branching DataFrame, which
+    batch exports reuse for the combined table.
+    """
     # Validate parameters
     if not (f1 >= f2 >= f3 >= f4):
         raise ValueError(f"Invalid Young tableau: [{f1},{f2},{f3},{f4}] must satisfy f1≥f2≥f3≥f4")
     
-    # Create representation identifiers
-    notation = f"[{f1},{f2},{f3},{f4}]"
-    tag = f"{f1}_{f2}_{f3}_{f4}"
-    
     # Generate DataFrames
     if verbose:
-        print(f"Processing SU(4) representation {notation}...")
-    
-    su4_info, st_branching = su4_module.racah_su4_to_st(f1, f2, f3, f4, verbose=False)
+        print(f"Processing SU(4) representation [{f1},{f2},{f3},{f4}]...")
     
-    # Setup output directory
-    out_dir = Path(out_dir).expanduser().resolve()
-    out_dir.mkdir(parents=True, exist_ok=True)
+    su4_info, st_branching = _branching_dataframes(su4_module, f1, f2, f3, f4)
     
     # Define file paths
+    tag = f"{f1}_{f2}_{f3}_{f4}"
     files = {
         'su4_csv': out_dir / f"su4_representation_{tag}.csv",
         'st_csv': out_dir / f"su4_branching_rules_{tag}.csv", 
@@ -61,50 +127,43 @@ def export_su4_with_labels(f1: int, f2: int, f3: int, f4: int,
     # Export CSV files
     if verbose:
         print("Exporting CSV files...")
-    su4_info.to_csv(files['su4_csv'], index=False)
-    st_branching.to_csv(files['st_csv'], index=False)
+    _half_integer_csv(su4_info, ["p1", "p2", "p3"]).to_csv(files['su4_csv'], index=False)
+    _half_integer_csv(st_branching, ["Spin", "Isospin"]).to_csv(files['st_csv'], index=False)
     
     # Export LaTeX files
     if verbose:
         print("Exporting LaTeX files...")
     
+    notation = f"[{f1},{f2},{f3},{f4}]"
+    
     # SU(4) representation table
     with open(files['su4_tex'], "w", encoding="utf-8") as f:
         f.write(f"% SU(4) Representation {notation} Information\n")
         f.write(f"% Generated automatically\n\n")
-        f.write(
-            su4_info.to_latex(
-                index=False,
-                escape=False,
-                column_format="|" + "c|" * len(su4_info.columns),  # DINÁMICO
-                caption=rf"SU(4) Representation {notation} - Basic Information",
-                label=f"tab:su4_info_{tag}",
-                longtable=False,
-                multicolumn=True,
-                multicolumn_format="c",
-                bold_rows=True,
-                position="htbp"
-            )
+        su4_info.to_latex(
+            buf=f,
+            index=False,
+            escape=False,
+            column_format="|" + "c|" * len(su4_info.columns),  # DINÁMICO
+            formatters=_half_integer_formatters(su4_info, ["p1", "p2", "p3"]),
+            caption=rf"SU(4) Representation {notation} - Basic Information",
+            label=f"tab:su4_info_{tag}",
+            longtable=False,
+            multicolumn=True,
+            multicolumn_format="c",
+            bold_rows=True,
+            position="htbp"
         )
     
     # Branching rules table
     with open(files['st_tex'], "w", encoding="utf-8") as f:
         f.write(f"% Branching Rules for SU(4) Representation {notation}\n")
         f.write(f"% Generated automatically\n\n")
-        f.write(
-            st_branching.to_latex(
-                index=False,
-                escape=False,
-                column_format="|c|c|c|c|c|",  # CORREGIDO - comilla de cierre añadida
-                caption=rf"Branching Rules for SU(4) Representation {notation} to $(S,T)$",
-                label=f"tab:branching_rules_{tag}",
-                longtable=False,
-                multicolumn=True,
-                multicolumn_format="c",
-                bold_rows=True,
-                position="htbp"
-            )
-        )
+        f.write(_fast_int_latex(
+            st_branching,
+            caption=rf"Branching Rules for SU(4) Representation {notation} to $(S,T)$",
+            label=f"tab:branching_rules_{tag}"
+        ))
     
     # Report results
     if verbose:
@@ -115,12 +174,58 @@ def export_su4_with_labels(f1: int, f2: int, f3: int, f4: int,
         print(f" • tab:su4_info_{tag}")
         print(f" • tab:branching_rules_{tag}")
     
-    return files
+    return files, st_branching
+
+def _export_su4_with_labels_worker(f1, f2, f3, f4, module_name, out_dir):
+    """Process-pool worker: _export_su4_with_labels_prepared with the module given by name"""
+    return _export_su4_with_labels_prepared(f1, f2, f3, f4,
+                                            importlib.import_module(module_name),
+                                            out_dir, verbose=False)
+
+def _importable_by_name(su4_module):
+    """True if importing su4_module.__name__ gives back su4_module (pool workers rely on it)"""
+    module_name = getattr(su4_module, "__name__", None)
+    if not module_name:
+        return False
+    try:
+        return importlib.import_module(module_name) is su4_module
+    except ImportError:
+        return False
+
+def _export_outcomes(irreps, su4_module, out_dir, workers):
+    """
+    Export each irrep and yield (irrep, (files, st_branching) or exception)
+    as exports finish.
+    
+    Uses a process pool when there is more than one irrep and the workers can
+    re-import su4_module by name (modules cannot be pickled); otherwise
+    exports serially with the module object itself.
+    """
+    if len(irreps) > 1 and workers != 1 and _importable_by_name(su4_module):
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = {ex.submit(_export_su4_with_labels_worker, *irrep,
+                                 su4_module.__name__, out_dir): irrep
+                       for irrep in irreps}
+            for future in as_completed(futures):
+                error = future.exception()
+                yield futures[future], error if error is not None else future.result()
+        return
+    
+    for irrep in irreps:
+        try:
+            outcome = _export_su4_with_labels_prepared(*irrep, su4_module, out_dir, verbose=False)
+        except Exception as e:
+            outcome = e
+        yield irrep, outcome
 
 def export_multiple_representations(irrep_list: list[tuple[int,int,int,int]], 
                                    su4_module,
                                    out_dir: str | Path = ".",
-                                   verbose: bool = True):
+                                   verbose: bool = True,
+                                   table_path: str | Path | None = None,
+                                   workers: int | None = None):
     """
     Export multiple SU(4) representations with labels.
     
@@ -134,42 +239,83 @@ def export_multiple_representations(irrep_list: list[tuple[int,int,int,int]],
         Output directory
     verbose : bool, default True
         Print progress messages
+    table_path : str or Path, optional
+        Also write the branching rules of all exported representations as one
+        long-format table (columns f1..f4 plus the (S,T) columns). A relative
+        path is taken relative to out_dir. A ".parquet" suffix writes Parquet
+        (requires pyarrow or fastparquet), anything else writes CSV.
+    workers : int, optional
+        Number of worker processes (default: os.cpu_count()). Single irreps,
+        workers=1 and modules that cannot be re-imported by name are
+        exported serially in this process.
     
     Returns:
     --------
     dict
         Dictionary mapping each representation to its generated files
+    
+    Raises:
+    -------
+    ExportError
+        If any representation failed. The other representations (and the
+        combined table) are still written; the exception's failed and
+        results attributes map each representation to its error and files.
     """
-    results = {}
-    successful = 0
-    failed = 0
+    # Duplicates are exported once so that no two workers write the same files
+    irreps = list(dict.fromkeys(tuple(irrep) for irrep in irrep_list))
+    exported = {}
+    failed = {}
     
     if verbose:
-        print(f"Batch export: {len(irrep_list)} representations")
+        print(f"Batch export: {len(irreps)} representations")
         print("-" * 50)
     
-    for i, (f1, f2, f3, f4) in enumerate(irrep_list, 1):
-        try:
-            if verbose:
-                print(f"[{i:2d}/{len(irrep_list)}] [{f1},{f2},{f3},{f4}]...", end=" ")
-            
-            files = export_su4_with_labels(f1, f2, f3, f4, su4_module, 
-                                         out_dir, verbose=False)
-            results[(f1, f2, f3, f4)] = files
-            successful += 1
-            
-            if verbose:
-                print("✓")
-                
-        except Exception as e:
-            failed += 1
+    # Resolve and create the output directory once for the whole batch
+    out_dir = Path(out_dir).expanduser().resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    
+    if table_path is not None:
+        table_path = out_dir / Path(table_path).expanduser()
+        # Fail before exporting anything rather than after the whole batch
+        if (table_path.suffix == ".parquet" and importlib.util.find_spec("pyarrow") is None
+                and importlib.util.find_spec("fastparquet") is None):
+            raise ImportError("Writing a .parquet table requires pyarrow or fastparquet")
+    st_frames = {}
+    
+    for i, ((f1, f2, f3, f4), outcome) in enumerate(
+            _export_outcomes(irreps, su4_module, out_dir, workers), 1):
+        if isinstance(outcome, Exception):
+            failed[(f1, f2, f3, f4)] = outcome
             if verbose:
-                print(f"✗ Error: {e}")
+                print(f"[{i:2d}/{len(irreps)}] [{f1},{f2},{f3},{f4}]... ✗ Error: {outcome}")
+            continue
+        
+        exported[(f1, f2, f3, f4)], st_frames[(f1, f2, f3, f4)] = outcome
+        
+        if verbose:
+            print(f"[{i:2d}/{len(irreps)}] [{f1},{f2},{f3},{f4}]... ✓")
+    
+    # Report results in input order, not completion order
+    results = {irrep: exported[irrep] for irrep in irreps if irrep in exported}
+    
+    if table_path is not None and results:
+        # Long-format table from the exported DataFrames, in input order
+        table = pd.concat([st_frames[irrep] for irrep in results], keys=list(results),
+                          names=["f1", "f2", "f3", "f4", None])
+        table = table.reset_index(level=[0, 1, 2, 3]).reset_index(drop=True)
+        if table_path.suffix == ".parquet":
+            table.to_parquet(table_path, index=False)
+        else:
+            _half_integer_csv(table, ["Spin", "Isospin"]).to_csv(table_path, index=False)
+        if verbose:
+            print(f"Combined table: {table_path.name} ({len(table)} rows)")
     
     if verbose:
         print("-" * 50)
-        print(f"Summary: {successful} successful, {failed} failed")
+        print(f"Summary: {len(results)} successful, {len(failed)} failed")
     
+    if failed:
+        raise ExportError({irrep: failed[irrep] for irrep in irreps if irrep in failed}, results)
     return results
 
 # Command line interface